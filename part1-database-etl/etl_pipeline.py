@@ -18,9 +18,29 @@ import pandas as pd
 import numpy as np
 import phonenumbers
 from pathlib import Path
+from pandas.api.types import is_datetime64_any_dtype
 import mysql.connector
 from dotenv import load_dotenv
 import os
+import re
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+
+# Arrow-backed strings keep text columns in contiguous buffers and run .str kernels in C++
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = 'string[pyarrow]'
+except ImportError:
+    STRING_DTYPE = 'string'
+
+# Numba compiles the scalar phone normalizer; without it the same function runs as plain Python
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda func: func
 
 # Current file location
 CURRENT_DIR = Path(__file__).resolve().parent
@@ -32,91 +52,436 @@ PROJECT_ROOT = CURRENT_DIR.parent
 DATA_DIR = PROJECT_ROOT / "data"
 ETL_DIR = PROJECT_ROOT / "part1-database-etl"
 
+# Non-digit runs stripped from ids and phone numbers, compiled once for every column
+_DIGIT_RE = re.compile(r'\D+')
+
+# Date layouts seen in the raw files. Month-first, like format='mixed', so ambiguous dates parse the same
+DATE_FORMATS = {
+    r'\d{4}-\d{2}-\d{2}': '%Y-%m-%d',
+    r'\d{2}/\d{2}/\d{4}': '%m/%d/%Y',
+    r'\d{2}-\d{2}-\d{4}': '%m-%d-%Y',
+}
+
+# Rows read, transformed and uploaded at a time
+CHUNK_SIZE = 50_000
+
 # %%
-# Read raw data
+# Read raw data in chunks so the frames held at a time stay O(chunk) instead of O(file).
+# The cross-chunk de-duplication state (seen row hashes / keys) still grows with the file's unique rows.
+
+def read_raw_data(file_name, chunksize=CHUNK_SIZE, **kwargs):
+
+    return pd.read_csv(file_name, chunksize=chunksize, **kwargs)
+
+# Function to compute fill medians over the whole file in one pre-pass that reads only the numeric columns,
+# so a chunk whose column is all-null still gets the file's median instead of NaN
+def read_column_medians(file_name, numeric_cols):
+
+    return pd.read_csv(file_name, usecols=list(numeric_cols)).median().to_dict()
+
+# Function to test each value against a running set in O(chunk).
+# Series.isin would turn the whole set into a list and rebuild a hashtable from it on every chunk.
+def is_seen(s: pd.Series, seen: set) -> np.ndarray:
+
+    return np.fromiter((value in seen for value in s.tolist()), dtype=bool, count=len(s))
+
+# Function to drop rows whose key is repeated in the chunk or was already loaded from an earlier chunk,
+# keeping the first occurrence like a single drop_duplicates over the whole file would
+def drop_seen_keys(df: pd.DataFrame, key_col: str, seen_keys: set):
 
-def read_raw_data(file_name):
+    df = df.drop_duplicates(subset=key_col, keep='first')
+    new = ~is_seen(df[key_col], seen_keys)
+    seen_keys.update(df.loc[new, key_col])
 
-    return pd.read_csv(file_name)
+    return df[new]
     
 
 # %%
-#Data Quality Report
-data_quality_report = []
+# Function to parse dates with fixed formats, leaving format='mixed' for the rows nothing else matched
+def parse_dates_fast(s: pd.Series) -> pd.Series:
+
+    # Already parsed upstream (e.g. a cached or pre-typed chunk), nothing to re-parse
+    if is_datetime64_any_dtype(s):
+        return s
+
+    values = s.dropna()
+    probe = str(values.iloc[0]) if len(values) > 0 else ''
+
+    # Try the layout of the first value over the whole column, then the others on what's left
+    formats = list(DATE_FORMATS.values())
+    for pattern, fmt in DATE_FORMATS.items():
+        if re.fullmatch(pattern, probe):
+            formats.remove(fmt)
+            formats.insert(0, fmt)
+            break
+
+    parsed = pd.Series(pd.NaT, index=s.index, dtype='datetime64[ns]')
+    pending = s.notna()
+
+    for fmt in formats + ['mixed']:
+        if not pending.any():
+            break
+        result = pd.to_datetime(s[pending], format=fmt, errors="coerce")
+        # A UTC offset makes the pass tz-aware; dropping it keeps the wall-clock date format='mixed' alone prints,
+        # and keeps parsed naive so the assignment doesn't upcast it to object
+        if isinstance(result.dtype, pd.DatetimeTZDtype):
+            result = result.dt.tz_localize(None)
+        parsed[pending] = result
+        pending &= parsed.isna()
+
+    return parsed
 
-# Function to check and handling missing value in the columns of the dataframe
-def find_treat_missing_val(df: pd.DataFrame):
-
-    df = df.copy()
+# %%
+# Function to check and handling missing value in the columns of the dataframe.
+# medians are file-wide fill values from read_column_medians; seen_rows holds the row hashes of earlier chunks
+def find_treat_missing_val(df: pd.DataFrame, medians=None, seen_rows=None):
 
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     categorical_cols = df.select_dtypes(include=["object", "category", "bool"]).columns
 
-    missing_summary = []
+    nulls = df.isna().sum()
+    missing_summary = {col: int(cnt) for col, cnt in nulls[nulls > 0].items()}
+
+    # File-wide medians where given, else the chunk's own computed in one pass; 'Unknown' for everything else.
+    # With file-wide medians only their columns count as numeric: an all-null text column reads as float64.
+    hash_numeric = list(numeric_cols) if medians is None else list(medians)
+    if medians is None:
+        medians = df[numeric_cols.intersection(list(missing_summary))].median().to_dict()
+    fill_values = {col: medians[col] if col in medians else 'Unknown' for col in missing_summary}
+
+    # Cleaned columns are collected here so the caller's frame is never copied or mutated
+    cleaned = {}
+
+    if fill_values:
+        to_fill = df[list(fill_values)]
 
-    for col, cnt in df.isna().sum().items():
-        if cnt > 0:
-            missing_summary.append(f"{col}: {cnt}")
-            if col in numeric_cols:
-                df[col] = df[col].fillna(df[col].median())
-            else:
-                df[col] = df[col].fillna('Unknown')
+        # Categoricals need the placeholder registered as a category before it can be filled in
+        placeholder_cats = {
+            col: to_fill[col].cat.add_categories('Unknown')
+            for col in to_fill.select_dtypes(include=["category"]).columns
+            if 'Unknown' not in to_fill[col].cat.categories
+        }
+        if placeholder_cats:
+            to_fill = to_fill.assign(**placeholder_cats)
+
+        cleaned = to_fill.fillna(fill_values).to_dict('series')
 
     # Handle date column
     dte_col = df.columns[df.columns.str.contains('date', case=False)]
     if len(dte_col) > 0:
-        df.loc[:, dte_col[0]] = pd.to_datetime(
-            df[dte_col[0]],
-            format='mixed',
-            errors="coerce"
-        ).dt.strftime("%Y-%m-%d")
+        dates = cleaned.get(dte_col[0], df[dte_col[0]])
+        cleaned[dte_col[0]] = parse_dates_fast(dates).dt.strftime("%Y-%m-%d")
+
+    if cleaned:
+        df = pd.DataFrame({col: cleaned.get(col, df[col]) for col in df.columns}, copy=False)
+
+    # Single hash pass: a row is a duplicate if it repeats within the chunk or an earlier chunk
+    if seen_rows is None:
+        seen_rows = set()
+    # Numeric columns are hashed as float64: a value reads as int64 in a chunk without nulls and as float64
+    # in one with them, and the hash of a row must not depend on which chunk it landed in
+    row_hashes = pd.util.hash_pandas_object(df.astype(dict.fromkeys(hash_numeric, 'float64')), index=False)
+    duplicated = row_hashes.duplicated().to_numpy() | is_seen(row_hashes, seen_rows)
+    seen_rows.update(row_hashes[~duplicated].tolist())
 
-    transform_df = df.drop_duplicates().copy()
+    transform_df = df[~duplicated]
+    duplicate_rows = int(duplicated.sum())
 
-    data_quality_report.append({
+    dq_stats = {
         'Record Count': len(df),
-        'Duplicate Rows': int(df.duplicated().sum()),
-        'Null Count': ", ".join(missing_summary) if missing_summary else "No Nulls",
+        'Duplicate Rows': duplicate_rows,
+        'Null Count': missing_summary,
         'Insert Count': len(transform_df)
-    })
+    }
 
-    
-    
-    return transform_df, data_quality_report
+    return transform_df, dq_stats
+
+# Function to add one chunk's data quality counters onto the running totals of its dataset
+def accumulate_dq_stats(totals: dict, dq_stats: dict):
+
+    for key in ('Record Count', 'Duplicate Rows', 'Insert Count'):
+        totals[key] = totals.get(key, 0) + dq_stats[key]
+    totals.setdefault('Null Count', Counter()).update(dq_stats['Null Count'])
+
+    return totals
+
+# Function to turn the accumulated counters of a dataset into a report row
+def summarize_dq_stats(totals: dict):
+
+    null_count = totals.get('Null Count', {})
+
+    return {
+        'Record Count': totals.get('Record Count', 0),
+        'Duplicate Rows': totals.get('Duplicate Rows', 0),
+        'Null Count': ", ".join(f"{col}: {cnt}" for col, cnt in null_count.items()) if null_count else "No Nulls",
+        'Insert Count': totals.get('Insert Count', 0)
+    }
+
+# %%
+# Function to title-case a categorical column on its categories rather than on every row
+def title_categories(s: pd.Series) -> pd.Series:
+
+    titled = s.cat.categories.str.title()
+    categories = titled.unique()
+
+    # old category code -> code of its title-cased category, with -1 (NaN) kept as -1
+    remap = np.append(categories.get_indexer(titled), -1)
+
+    return pd.Series(
+        pd.Categorical.from_codes(remap[s.cat.codes], categories),
+        index=s.index,
+        name=s.name
+    )
 
 # %% [markdown]
 # ## Inserting the data to the MYSQL database tables
 
 # %%
-# Function to upload data to MySQL database
-def upload_data_db(df: pd.DataFrame, table_name: str):
+# Rows per multi-row INSERT statement
+BATCH_SIZE = 10_000
+
+# Upper bound for one INSERT statement, kept below MySQL's default max_allowed_packet (64MB)
+MAX_STATEMENT_BYTES = 16 * 1024 * 1024
+
+# Function to open a MySQL connection from the .env settings
+def get_db_connection(**kwargs):
     load_dotenv()
 
-    conn = mysql.connector.connect(
+    return mysql.connector.connect(
         host=os.getenv("MYSQL_HOST"),
         port=int(os.getenv("MYSQL_PORT", 3306)),
         user=os.getenv("MYSQL_USER"),
         password=os.getenv("MYSQL_PASSWORD"),
         database=os.getenv("MYSQL_DATABASE"),
-        use_pure=True
+        # C extension by default; MYSQL_PURE=1 falls back to the pure-Python protocol implementation
+        use_pure=os.getenv("MYSQL_PURE", "0") == "1",
+        **kwargs
     )
 
+# Function to upsert data into a MySQL table; key_cols are the table's unique key and are never updated
+def upload_data_db(df: pd.DataFrame, table_name: str, key_cols=(), batch_size: int = BATCH_SIZE):
+
+    conn = get_db_connection()
+    conn.autocommit = False
+
     cursor = conn.cursor()
 
+    # Shrink the batch for wide rows so a single statement fits in one packet
+    if len(df) > 0:
+        row_bytes = max(1, int(df.memory_usage(deep=True, index=False).sum() / len(df)))
+        batch_size = max(1, min(batch_size, MAX_STATEMENT_BYTES // row_bytes))
+
     cols = ",".join(df.columns)
-    placeholders = ",".join(["%s"] * len(df.columns))
+    placeholders = "(" + ",".join(["%s"] * len(df.columns)) + ")"
+    # Row alias instead of VALUES(col), which is deprecated since MySQL 8.0.20
+    updates = ",".join(f"{col}=new.{col}" for col in df.columns if col not in key_cols)
+    on_duplicate = f"AS new ON DUPLICATE KEY UPDATE {updates}" if updates else ""
+    insert = "INSERT" if updates else "INSERT IGNORE"
+
+    try:
+        # unique_checks stays on: the upsert depends on InnoDB detecting duplicate keys
+        cursor.execute("SET SESSION foreign_key_checks=0")
+
+        # One multi-row INSERT per batch instead of one round-trip per row.
+        # Rows are streamed as tuples, so no list-of-lists copy of the whole frame is built.
+        rows = df.itertuples(index=False, name=None)
+        while batch := list(islice(rows, batch_size)):
+            values = ",".join([placeholders] * len(batch))
+            sql = f"{insert} INTO {table_name} ({cols}) VALUES {values} {on_duplicate}"
+            cursor.execute(sql, list(chain.from_iterable(batch)))
+
+        conn.commit()
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
 
-    sql = f"INSERT INTO {table_name} ({cols}) VALUES ({placeholders})"
+    print(f"✅ Loaded {len(df)} records into {table_name}")
 
-    cursor.executemany(sql, df.values.tolist())
+# Function to bulk load append-only data with LOAD DATA LOCAL INFILE, bypassing SQL parsing of the rows.
+# Rows whose key already exists are skipped (LOCAL implies IGNORE); use upload_data_db when they must be updated.
+def bulk_load_db(df: pd.DataFrame, table_name: str):
 
-    conn.commit()
-    cursor.close()
-    conn.close()
+    cols = ",".join(df.columns)
 
-    print(f"✅ Loaded {len(df)} records into {table_name}")
+    # LOAD DATA reads backslash as its escape character, so literal backslashes in text are doubled;
+    # missing values are written as \N, which MySQL reads as NULL
+    text_cols = df.select_dtypes(include=["object", "string", "category"]).columns
+    escaped = df.assign(**{
+        col: df[col].astype(STRING_DTYPE).str.replace('\\', '\\\\', regex=False)
+        for col in text_cols
+    })
+
+    # The connector reads LOCAL INFILE data from a file path, so the chunk is spooled to a temp TSV
+    # before a connection is opened
+    f = tempfile.NamedTemporaryFile("w", suffix=".tsv", newline="", encoding="utf-8", delete=False)
+    tsv_path = Path(f.name)
+
+    try:
+        with f:
+            escaped.to_csv(f, sep="\t", index=False, header=False, na_rep="\\N", lineterminator="\n")
+
+        # LOCAL INFILE is allowed only under the temp dir, so the server can't request any other client file
+        conn = get_db_connection(allow_local_infile_in_path=tempfile.gettempdir())
+        conn.autocommit = False
+
+        cursor = conn.cursor()
+
+        try:
+            # unique_checks stays on: skipping duplicate keys depends on InnoDB detecting them
+            cursor.execute("SET SESSION foreign_key_checks=0")
+
+            cursor.execute(
+                f"LOAD DATA LOCAL INFILE '{tsv_path.as_posix()}' INTO TABLE {table_name} "
+                "CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY '\\t' OPTIONALLY ENCLOSED BY '\"' "
+                "LINES TERMINATED BY '\\n' "
+                f"({cols})"
+            )
+            loaded = cursor.rowcount
+
+            # Skipped duplicates and conversion problems only surface as warnings under IGNORE
+            cursor.execute("SHOW WARNINGS")
+            warnings = cursor.fetchall()
+
+            conn.commit()
+        except mysql.connector.Error:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    finally:
+        tsv_path.unlink(missing_ok=True)
+
+    print(f"✅ Loaded {loaded} of {len(df)} records into {table_name}")
+
+    if warnings:
+        print(f"⚠️ {len(warnings)} warnings while loading {table_name}:")
+        for level, code, message in warnings[:10]:
+            print(f"   {level} {code}: {message}")
+
+# Foreign keys checked after the concurrent load: (child table, column, parent table, parent key)
+FOREIGN_KEYS = [
+    ('orders', 'customer_id', 'customers', 'customer_id'),
+    ('order_items', 'order_id', 'orders', 'order_id'),
+    ('order_items', 'product_id', 'products', 'product_id'),
+]
+
+# Function to count child rows whose foreign key has no parent row.
+# The loads run with foreign_key_checks=0, so this is where referential integrity is verified.
+def check_orphans():
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    orphans = {}
+
+    try:
+        for child, col, parent, key in FOREIGN_KEYS:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {child} c LEFT JOIN {parent} p ON p.{key} = c.{col} "
+                f"WHERE c.{col} IS NOT NULL AND p.{key} IS NULL"
+            )
+            (count,) = cursor.fetchone()
+            orphans[f"{child}.{col}"] = count
+            if count:
+                print(f"⚠️ {count} rows in {child} reference a missing {parent}.{key}")
+    finally:
+        cursor.close()
+        conn.close()
+
+    return orphans
    
 
+# %%
+# Function to keep only the digits of an id / phone column
+def digits_only(s: pd.Series) -> pd.Series:
+
+    # Arrow's regex kernel takes the pattern text; a compiled pattern would fall back to Python
+    pattern = _DIGIT_RE.pattern if STRING_DTYPE == 'string[pyarrow]' else _DIGIT_RE
+
+    return s.astype(STRING_DTYPE).str.replace(pattern, '', regex=True)
+
+# Function to format Indian phone numbers to E.164 without a per-row Python loop
+def format_in_e164(s: pd.Series) -> pd.Series:
+    digits = digits_only(s)
+    length = digits.str.len()
+
+    # Local and trunk rules only apply to numbers dialled without an international prefix;
+    # any +/00 number other than +91 plus 10 digits is left for the residual path
+    national = ~s.astype(STRING_DTYPE).str.strip().str.match(r'(\+|00)').fillna(False)
+
+    local = (national & (length == 10)).fillna(False)
+    trunk = (national & digits.str.startswith('0') & (length == 11)).fillna(False)
+    intl = (digits.str.startswith('91') & (length == 12)).fillna(False)
+
+    out = np.select(
+        [local, trunk, intl],
+        ['+91' + digits, '+91' + digits.str[1:], '+' + digits],
+        default=None
+    )
+
+    return pd.Series(out, index=s.index, dtype=STRING_DTYPE)
+
+# Function to normalize the ASCII digits of one Indian number to 91XXXXXXXXXX, or -1 if it isn't one
+@njit(cache=True)
+def normalize_in_phone(buf):
+    n = len(buf)
+    start = 0
+
+    # 00 international prefix: only 0091 plus 10 digits is Indian, any other country is left to phonenumbers
+    if n > 10 and buf[0] == 48 and buf[1] == 48:
+        if n != 14 or buf[2] != 57 or buf[3] != 49:
+            return -1
+        start = 4
+    else:
+        # 91 country code, then 0 trunk prefix
+        if n - start > 10 and buf[start] == 57 and buf[start + 1] == 49:
+            start += 2
+        if n - start > 10 and buf[start] == 48:
+            start += 1
+
+    if n - start != 10:
+        return -1
+
+    number = 91
+    for i in range(start, n):
+        number = number * 10 + (int(buf[i]) - 48)
+
+    return number
+
+# Function to run normalize_in_phone over every row of one concatenated digit buffer, rows split by offsets,
+# so the whole residual is a single compiled loop
+@njit(cache=True)
+def normalize_in_phones(buf, offsets):
+    numbers = np.empty(len(offsets) - 1, dtype=np.int64)
+
+    for row in range(len(numbers)):
+        numbers[row] = normalize_in_phone(buf[offsets[row]:offsets[row + 1]])
+
+    return numbers
+
+# Function to run normalize_in_phones over the rows the vectorized formatter couldn't decide
+def format_in_e164_residual(s: pd.Series) -> pd.Series:
+    digits = digits_only(s).fillna('')
+
+    # A leading + is the same international prefix as 00, so both go through the normalizer's 00 rule
+    plus = s.astype(STRING_DTYPE).str.strip().str.startswith('+').fillna(False)
+    digits = digits.where(~plus, '00' + digits)
+
+    # One ASCII buffer for all rows plus the offset where each row starts
+    offsets = np.zeros(len(digits) + 1, dtype=np.int64)
+    np.cumsum(digits.str.len().to_numpy(dtype=np.int64), out=offsets[1:])
+    buf = np.frombuffer(''.join(digits.tolist()).encode('ascii'), dtype=np.uint8)
+
+    numbers = pd.Series(normalize_in_phones(buf, offsets), index=s.index)
+
+    # int -> string cast runs as one kernel; rows the normalizer rejected become NA
+    return ('+' + numbers.astype(STRING_DTYPE)).where(numbers >= 0)
+
 # %% [markdown]
 # ### Customer Data
 
@@ -127,47 +492,66 @@ from datetime import datetime
 def generate_data_quality_report_txt(report, file_name="data_quality_report.txt"):
     report_path = ETL_DIR / file_name
 
-    with open(report_path, "w") as f:
-        f.write("DATA QUALITY REPORT\n")
-        f.write("=" * 60 + "\n")
-        f.write(f"Generated On: {datetime.now()}\n\n")
-
-        for idx, row in enumerate(report, start=1):
-            f.write(f"Dataset #{idx}\n")
-            f.write(f"Records Processed      : {row['Record Count']}\n")
-            f.write(f"Duplicates Removed     : {row['Duplicate Rows']}\n")
-            f.write(f"Missing Values Handled : {row['Null Count']}\n")
-            f.write(f"Records Loaded         : {row['Insert Count']}\n")
-            f.write("-" * 60 + "\n")
-
-cust_df = read_raw_data(DATA_DIR / 'customers_raw.csv')
-
-cust_df_clean, dq_report = find_treat_missing_val(cust_df)
-
-#phone number formatting
-cust_df_clean.loc[:, 'phone'] = cust_df_clean['phone'].apply(
-    lambda x: phonenumbers.format_number(
-        phonenumbers.parse(str(x), region='IN'),
-        phonenumbers.PhoneNumberFormat.E164
-    ) if pd.notna(x) else None
-)
-
-#customer_id formatting
-cust_df_clean.loc[:, 'customer_id'] = (
-    cust_df_clean['customer_id']
-    .astype(str)
-    .str.replace(r'\D+', '', regex=True)
-)
-
-#Remove duplicates before uploading to DB
-cust_df_clean = cust_df_clean.drop_duplicates(
-    subset='customer_id',
-    keep='first'
-)
-
-#upload to DB
-upload_data_db(cust_df_clean,'customers')
-cust_df_clean.head()
+    lines = [
+        "DATA QUALITY REPORT",
+        "=" * 60,
+        f"Generated On: {datetime.now()}",
+        ""
+    ]
+
+    for idx, row in enumerate(report, start=1):
+        lines.extend((
+            f"Dataset #{idx}",
+            f"Records Processed      : {row['Record Count']}",
+            f"Duplicates Removed     : {row['Duplicate Rows']}",
+            f"Missing Values Handled : {row['Null Count']}",
+            f"Records Loaded         : {row['Insert Count']}",
+            "-" * 60
+        ))
+
+    # Build the whole report in memory and write it in one go
+    report_path.write_text("\n".join(lines) + "\n")
+
+# %%
+def process_customers():
+    dq_totals = {}
+    seen_rows = set()
+    seen_ids = set()
+
+    for cust_df in read_raw_data(
+        DATA_DIR / 'customers_raw.csv',
+        usecols=['customer_id', 'first_name', 'last_name', 'email', 'phone', 'city', 'registration_date'],
+        dtype={'customer_id': STRING_DTYPE, 'phone': STRING_DTYPE}
+    ):
+        # customers has no numeric columns, so every missing value is filled with 'Unknown'
+        cust_df_clean, dq_stats = find_treat_missing_val(cust_df, medians={}, seen_rows=seen_rows)
+        accumulate_dq_stats(dq_totals, dq_stats)
+
+        #phone number formatting, phonenumbers only for rows neither fast path can decide
+        phone = format_in_e164(cust_df_clean['phone'])
+        residual = phone.isna() & cust_df_clean['phone'].notna()
+        if residual.any():
+            phone[residual] = format_in_e164_residual(cust_df_clean.loc[residual, 'phone'])
+            residual = phone.isna() & cust_df_clean['phone'].notna()
+        phone[residual] = cust_df_clean.loc[residual, 'phone'].apply(
+            lambda x: phonenumbers.format_number(
+                phonenumbers.parse(str(x), region='IN'),
+                phonenumbers.PhoneNumberFormat.E164
+            )
+        )
+        # assign() builds a new frame: cust_df_clean may be a filtered view of the chunk
+        cust_df_clean = cust_df_clean.assign(
+            phone=phone.astype(object).where(phone.notna(), None),
+            customer_id=digits_only(cust_df_clean['customer_id'])
+        )
+
+        #Remove duplicates before uploading to DB, first occurrence across all chunks wins
+        cust_df_clean = drop_seen_keys(cust_df_clean, 'customer_id', seen_ids)
+
+        #upload to DB
+        upload_data_db(cust_df_clean,'customers', key_cols=('customer_id',))
+
+    return summarize_dq_stats(dq_totals)
 
 # %% [markdown]
 # ![image.png](attachment:image.png)
@@ -176,12 +560,30 @@ cust_df_clean.head()
 # ### Product 
 
 # %%
-prod_df = read_raw_data(DATA_DIR /'products_raw.csv')
-prod_df_clean, dq_report = find_treat_missing_val(prod_df)
-prod_df_clean['product_id'] = prod_df_clean['product_id'].astype(str).str.replace(r'\D+', '', regex=True)
-prod_df_clean['category'] = prod_df_clean['category'].str.title()
-upload_data_db(prod_df_clean,'products')
-prod_df_clean.head()
+def process_products():
+    dq_totals = {}
+    seen_rows = set()
+    seen_ids = set()
+
+    medians = read_column_medians(DATA_DIR /'products_raw.csv', ['price', 'stock_quantity'])
+
+    for prod_df in read_raw_data(
+        DATA_DIR /'products_raw.csv',
+        usecols=['product_id', 'product_name', 'category', 'price', 'stock_quantity'],
+        dtype={'product_id': STRING_DTYPE, 'category': 'category'}
+    ):
+        prod_df_clean, dq_stats = find_treat_missing_val(prod_df, medians=medians, seen_rows=seen_rows)
+        accumulate_dq_stats(dq_totals, dq_stats)
+
+        # assign() builds a new frame: prod_df_clean may be a filtered view of the chunk
+        prod_df_clean = prod_df_clean.assign(
+            product_id=digits_only(prod_df_clean['product_id']),
+            category=title_categories(prod_df_clean['category'])
+        )
+        prod_df_clean = drop_seen_keys(prod_df_clean, 'product_id', seen_ids)
+        upload_data_db(prod_df_clean,'products', key_cols=('product_id',))
+
+    return summarize_dq_stats(dq_totals)
 
 # %% [markdown]
 # ![image-2.png](attachment:image-2.png)
@@ -190,21 +592,54 @@ prod_df_clean.head()
 # ### Transcation Data
 
 # %%
-sales_df = read_raw_data(DATA_DIR /'sales_raw.csv')
-sales_df_clean, dq_report = find_treat_missing_val(sales_df)
-
-
-
-sales_df_clean = sales_df_clean[~sales_df_clean.eq('Unknown').any(axis=1)]
-
-sales_df_clean['total_amount'] = sales_df_clean['quantity'] * sales_df_clean['unit_price'] 
-sales_df_clean[['transaction_id', 'customer_id','product_id']] = sales_df_clean[['transaction_id', 'customer_id','product_id']].astype(str).apply(lambda s:s.str.replace(r'\D+', '', regex=True))
-sales_df_clean.rename(columns={'transaction_id': 'order_id','transaction_date':'order_date'}, inplace=True)
-
-# %%
-upload_data_db(sales_df_clean[['order_id','customer_id','order_date','total_amount','status']],'orders')
-upload_data_db(sales_df_clean[['product_id','order_id','quantity','unit_price']],'order_items')
-sales_df_clean.head()
+def process_sales():
+    dq_totals = {}
+    seen_rows = set()
+
+    medians = read_column_medians(DATA_DIR /'sales_raw.csv', ['quantity', 'unit_price'])
+
+    for sales_df in read_raw_data(
+        DATA_DIR /'sales_raw.csv',
+        usecols=['transaction_id', 'customer_id', 'product_id', 'quantity', 'unit_price', 'transaction_date', 'status'],
+        dtype={
+            'transaction_id': STRING_DTYPE,
+            'customer_id': STRING_DTYPE,
+            'product_id': STRING_DTYPE,
+            'status': 'category'
+        }
+    ):
+        sales_df_clean, dq_stats = find_treat_missing_val(sales_df, medians=medians, seen_rows=seen_rows)
+        accumulate_dq_stats(dq_totals, dq_stats)
+
+        # Drop rows whose ids were filled with the 'Unknown' placeholder; only string columns can hold it
+        unknown = np.zeros(len(sales_df_clean), dtype=bool)
+        for col in sales_df_clean.select_dtypes(include=["object", "string", "category"]).columns:
+            unknown |= sales_df_clean[col].eq('Unknown').to_numpy(dtype=bool, na_value=False)
+        sales_df_clean = sales_df_clean[~unknown]
+
+        # New and renamed columns are built on the side and joined with a single concat.
+        # Ids are cleaned per column so they stay Arrow strings; stacking them would go through Python str objects.
+        new_cols = {
+            'order_id': digits_only(sales_df_clean['transaction_id']),
+            'customer_id': digits_only(sales_df_clean['customer_id']),
+            'product_id': digits_only(sales_df_clean['product_id'])
+        }
+        new_cols['order_date'] = sales_df_clean['transaction_date'].to_numpy()
+        new_cols['total_amount'] = sales_df_clean['quantity'].to_numpy() * sales_df_clean['unit_price'].to_numpy()
+
+        sales_df_clean = pd.concat(
+            [
+                sales_df_clean[['quantity', 'unit_price', 'status']],
+                pd.DataFrame(new_cols, index=sales_df_clean.index)
+            ],
+            axis=1
+        )
+
+        # orders before order_items; foreign keys are not enforced during the load and are verified by check_orphans
+        bulk_load_db(sales_df_clean[['order_id','customer_id','order_date','total_amount','status']],'orders')
+        bulk_load_db(sales_df_clean[['product_id','order_id','quantity','unit_price']],'order_items')
+
+    return summarize_dq_stats(dq_totals)
 
 # %% [markdown]
 # ![image.png](attachment:image.png)
@@ -216,9 +651,25 @@ sales_df_clean.head()
 # ### Data Quality Report
 
 # %%
-pd.DataFrame(data_quality_report)
+def main():
+    # The three files share no state, so read/transform of one overlaps the upload of another.
+    # Every upload opens its own connection with foreign_key_checks off, so MySQL does not enforce
+    # referential integrity while the tables load in parallel; check_orphans verifies it afterwards.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(process_customers),
+            executor.submit(process_products),
+            executor.submit(process_sales)
+        ]
+        # One report row per dataset, in the order the datasets are listed
+        data_quality_report = [future.result() for future in futures]
 
-# %%
-generate_data_quality_report_txt(data_quality_report)
+    check_orphans()
+
+    print(pd.DataFrame(data_quality_report))
+
+    generate_data_quality_report_txt(data_quality_report)
 
 
+if __name__ == "__main__":
+    main()